@@ -1,14 +1,31 @@
 import argparse
+import heapq
 import json
-from dataclasses import dataclass, asdict
-from datetime import date, timedelta
+import math
+import sys
+import time
+from collections import defaultdict
+from dataclasses import dataclass, replace
+from datetime import date, datetime, timedelta, timezone
+from itertools import chain, cycle, islice
+from operator import attrgetter
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
 
-DATA_FILE = Path("records.json")
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
+DATA_FILE = Path("records.jsonl")
+LEGACY_DATA_FILE = Path("records.json")
 
-@dataclass
+CHART_PALETTE = ["#5c6bfe", "#7b8cff", "#a2b1ff", "#c6d0ff", "#8996ff", "#3f4de3"]
+CHART_BAR_COLORS = [color + "cc" for color in CHART_PALETTE]
+CHART_PIE_COLORS = [color + "d9" for color in CHART_PALETTE]
+
+
+@dataclass(slots=True, frozen=True)
 class Record:
     name: str
     amount: float
@@ -18,50 +35,181 @@ class Record:
     created_at: str
 
 
-def load_records() -> List[Record]:
-    if not DATA_FILE.exists():
-        return []
-    with DATA_FILE.open("r", encoding="utf-8") as f:
-        raw = json.load(f)
-    return [Record(**item) for item in raw]
+def record_to_dict(record: Record) -> Dict[str, Any]:
+    return {
+        "name": record.name,
+        "amount": record.amount,
+        "category": record.category,
+        "usage_frequency": record.usage_frequency,
+        "usage_minutes": record.usage_minutes,
+        "created_at": record.created_at,
+    }
+
+
+def record_from_dict(item: Dict[str, Any]) -> Record:
+    return Record(
+        item["name"],
+        item["amount"],
+        sys.intern(item["category"]),
+        sys.intern(item["usage_frequency"]),
+        item["usage_minutes"],
+        item["created_at"],
+    )
+
+
+_created_key = attrgetter("created_at")
+_json_encoder = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"))
+
+_cache: Optional[Tuple[Tuple[int, int], Tuple[Record, ...]]] = None
+_today_iso_cache: Tuple[float, str] = (0.0, "")
+_dashboard_cache: Optional[Tuple[Tuple[object, int], Dict[str, object]]] = None
+
+
+def _data_file_key() -> Optional[Tuple[int, int]]:
+    try:
+        st = DATA_FILE.stat()
+    except FileNotFoundError:
+        return None
+    return st.st_mtime_ns, st.st_size
 
 
-def save_records(records: List[Record]) -> None:
-    with DATA_FILE.open("w", encoding="utf-8") as f:
-        json.dump([asdict(r) for r in records], f, ensure_ascii=False, indent=2)
+def _loads(data: bytes) -> Any:
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+
+def _decode_records(data: bytes) -> Tuple[Record, ...]:
+    records = tuple(record_from_dict(item) for item in _loads(data))
+    # orjson decodes integers beyond 64 bits as floats; re-read those with json.
+    if orjson is not None and any(type(record.usage_minutes) is float for record in records):
+        records = tuple(record_from_dict(item) for item in json.loads(data))
+    return records
+
+
+def _encode_record(record: Record) -> bytes:
+    if orjson is not None:
+        try:
+            return orjson.dumps(record, option=orjson.OPT_APPEND_NEWLINE)
+        except TypeError:
+            pass
+    return (_json_encoder.encode(record_to_dict(record)) + "\n").encode("utf-8")
+
+
+def _migrate_legacy_file() -> Tuple[Record, ...]:
+    if not LEGACY_DATA_FILE.exists():
+        return ()
+    records = tuple(record_from_dict(item) for item in json.loads(LEGACY_DATA_FILE.read_bytes()))
+    save_records(records)
+    return records
+
+
+def load_records() -> Tuple[Record, ...]:
+    global _cache
+    key = _data_file_key()
+    if key is None:
+        return _migrate_legacy_file()
+    if _cache is not None and _cache[0] == key:
+        return _cache[1]
+    lines = [line for line in DATA_FILE.read_bytes().splitlines() if line.strip()]
+    records = _decode_records(b"[" + b",".join(lines) + b"]")
+    _cache = (key, records)
+    return records
+
+
+def iter_records() -> Iterator[Record]:
+    key = _data_file_key()
+    if key is None:
+        yield from _migrate_legacy_file()
+        return
+    if _cache is not None and _cache[0] == key:
+        yield from _cache[1]
+        return
+    with DATA_FILE.open("rb") as f:
+        for line in f:
+            if line.strip():
+                yield from _decode_records(b"[" + line + b"]")
+
+
+def save_records(records: Sequence[Record]) -> None:
+    global _cache, _dashboard_cache
+    _dashboard_cache = None
+    payload = b"".join(map(_encode_record, records))
+    DATA_FILE.write_bytes(payload)
+    key = _data_file_key()
+    if key is not None and key[1] == len(payload):
+        _cache = (key, tuple(records))
+    else:
+        _cache = None
+
+
+def append_record(record: Record) -> None:
+    global _cache, _dashboard_cache
+    _dashboard_cache = None
+    key = _data_file_key()
+    if key is None:
+        _migrate_legacy_file()
+        key = _data_file_key()
+    payload = _encode_record(record)
+    with DATA_FILE.open("ab") as f:
+        f.write(payload)
+    new_key = _data_file_key()
+    if (
+        _cache is not None
+        and key is not None
+        and _cache[0] == key
+        and new_key is not None
+        and new_key[1] == key[1] + len(payload)
+    ):
+        _cache = (new_key, _cache[1] + (record,))
+    else:
+        _cache = None
+
+
+def minutes_in_range(minutes: int) -> bool:
+    return -(2**63) <= minutes < 2**63
+
+
+def today_iso() -> str:
+    global _today_iso_cache
+    if time.time() >= _today_iso_cache[0]:
+        today = date.today()
+        midnight = datetime.combine(today + timedelta(days=1), datetime.min.time())
+        _today_iso_cache = (midnight.timestamp(), today.isoformat())
+    return _today_iso_cache[1]
 
 
 def add_record(args: argparse.Namespace) -> None:
-    records = load_records()
     new_record = Record(
         name=args.name,
         amount=args.amount,
         category=args.category,
         usage_frequency=args.frequency,
         usage_minutes=args.usage_minutes,
-        created_at=args.date or date.today().isoformat(),
+        created_at=args.date or today_iso(),
     )
-    records.append(new_record)
-    save_records(records)
+    append_record(new_record)
     print("已添加记录：")
     print_record(new_record)
 
 
-def print_record(record: Record) -> None:
-    print(
+def format_record(record: Record) -> str:
+    return (
         f"- {record.created_at} | {record.name} | ￥{record.amount:.2f} | "
         f"类别: {record.category} | 频率/时长: {record.usage_frequency} / {record.usage_minutes}分钟"
     )
 
 
+def print_record(record: Record) -> None:
+    print(format_record(record))
+
+
 def list_records(_: argparse.Namespace) -> None:
-    records = load_records()
-    if not records:
+    records = iter_records()
+    first = next(records, None)
+    if first is None:
         print("暂无记录，可使用 add 子命令添加。")
         return
     print("所有记录：")
-    for record in records:
-        print_record(record)
+    sys.stdout.writelines(format_record(record) + "\n" for record in chain([first], records))
 
 
 def stats_panel(_: argparse.Namespace) -> None:
@@ -70,47 +218,52 @@ def stats_panel(_: argparse.Namespace) -> None:
         print("暂无记录，无法生成统计面板。")
         return
 
+    summary, per_day = _aggregate(records)
     print("=== 统计面板（类似屏幕使用时间）===")
-    summarize_by_frequency(records)
-    summarize_by_day(records)
+    summarize_by_frequency(summary)
+    summarize_by_day(per_day)
+
 
+def _aggregate(
+    records: Sequence[Record],
+) -> Tuple[Dict[str, List[float]], List[Tuple[str, int]]]:
+    today = date.today()
+    window = [(today - timedelta(days=offset)).isoformat() for offset in range(6, -1, -1)]
+    bucket_of = {day: index for index, day in enumerate(window)}
+    totals = [0] * len(window)
+    first_day, last_day = window[0], window[-1]
 
-def summarize_by_frequency(records: List[Record]) -> None:
-    summary: Dict[str, Dict[str, float]] = {}
+    summary: Dict[str, List[float]] = defaultdict(lambda: [0.0, 0, 0])
     for record in records:
-        freq = record.usage_frequency
-        if freq not in summary:
-            summary[freq] = {"amount": 0.0, "count": 0, "minutes": 0}
-        summary[freq]["amount"] += record.amount
-        summary[freq]["count"] += 1
-        summary[freq]["minutes"] += record.usage_minutes
+        stats = summary[record.usage_frequency]
+        stats[0] += record.amount
+        stats[1] += 1
+        stats[2] += record.usage_minutes
 
-    print("\n按使用频率/时长统计：")
-    for freq, stats in summary.items():
-        print(
-            f"- {freq}: {stats['count']} 笔 | 总支出 ￥{stats['amount']:.2f} | 总使用 {stats['minutes']} 分钟"
-        )
+        created = record.created_at
+        if first_day <= created <= last_day:
+            index = bucket_of.get(created)
+            if index is not None:
+                totals[index] += record.usage_minutes
 
+    return summary, list(zip(window, totals))
 
-def summarize_by_day(records: List[Record]) -> None:
-    today = date.today()
-    window = [today - timedelta(days=offset) for offset in range(6, -1, -1)]
-    per_day: Dict[str, int] = {d.isoformat(): 0 for d in window}
 
-    for record in records:
-        created = record.created_at
-        if created in per_day:
-            per_day[created] += record.usage_minutes
+def summarize_by_frequency(summary: Dict[str, List[float]]) -> None:
+    print("\n按使用频率/时长统计：")
+    for freq, (amount, count, minutes) in summary.items():
+        print(f"- {freq}: {count} 笔 | 总支出 ￥{amount:.2f} | 总使用 {minutes} 分钟")
+
 
-    max_minutes = max(per_day.values()) if per_day else 0
+def summarize_by_day(per_day: List[Tuple[str, int]]) -> None:
+    max_minutes = max(minutes for _, minutes in per_day)
     bar_width = 24
 
     print("\n近7天使用时间（分钟）柱状图：")
-    for day in window:
-        minutes = per_day[day.isoformat()]
+    for day, minutes in per_day:
         bar_length = int((minutes / max_minutes) * bar_width) if max_minutes else 0
-        bar = "█" * bar_length
-        print(f"{day.isoformat()} | {bar:<{bar_width}} {minutes:>4} 分钟")
+        bar = "█" * bar_length + " " * (bar_width - bar_length)
+        print(f"{day} | {bar} {minutes:>4} 分钟")
 
 
 def parse_iso_date(value: str) -> date:
@@ -129,39 +282,47 @@ def month_boundaries(today: date) -> Tuple[date, date]:
     return start, end
 
 
-def build_dashboard(records: List[Record]) -> Dict[str, object]:
+def build_dashboard(records: Sequence[Record]) -> Dict[str, object]:
     today = date.today()
     start_of_month, end_of_month = month_boundaries(today)
 
-    month_records = [
-        r
-        for r in records
-        if start_of_month <= parse_iso_date(r.created_at) <= end_of_month
-    ]
-    month_minutes = sum(r.usage_minutes for r in month_records)
-    month_amount = sum(r.amount for r in month_records)
-    total_minutes = sum(r.usage_minutes for r in records)
-    total_amount = sum(r.amount for r in records)
+    month_start = start_of_month.isoformat()
+    month_end = end_of_month.isoformat()
+
+    month_minutes = 0
+    month_amounts: List[float] = []
+    total_minutes = 0
+    total_amounts: List[float] = []
+    usage_by_project: Dict[str, int] = defaultdict(int)
+    for r in records:
+        total_minutes += r.usage_minutes
+        total_amounts.append(r.amount)
+        created = r.created_at
+        if len(created) == 10:
+            in_month = month_start <= created <= month_end
+        else:
+            in_month = start_of_month <= parse_iso_date(created) <= end_of_month
+        if in_month:
+            month_minutes += r.usage_minutes
+            month_amounts.append(r.amount)
+        usage_by_project[r.name] += r.usage_minutes
+
+    month_amount = math.fsum(month_amounts)
+    total_amount = math.fsum(total_amounts)
 
     elapsed_days = max((today - start_of_month).days + 1, 1)
     average_per_day = month_minutes / elapsed_days if month_minutes else 0
     progress = min(int((month_minutes / 60) * 100), 100) if month_minutes else 0
 
-    usage_by_project: Dict[str, int] = {}
-    for record in records:
-        usage_by_project[record.name] = (
-            usage_by_project.get(record.name, 0) + record.usage_minutes
-        )
-
     sorted_usage = sorted(usage_by_project.items(), key=lambda item: item[1], reverse=True)
     chart_labels = [item[0] for item in sorted_usage]
     chart_minutes = [item[1] for item in sorted_usage]
+    chart_colors_bar = list(islice(cycle(CHART_BAR_COLORS), len(chart_labels)))
+    chart_colors_pie = list(islice(cycle(CHART_PIE_COLORS), len(chart_labels)))
 
-    indexed_records = list(enumerate(records))
-    sorted_records = sorted(
-        indexed_records, key=lambda pair: parse_iso_date(pair[1].created_at), reverse=True
-    )
-    recent_records = sorted_records[:5]
+    created_dates = list(map(_created_key, records))
+    recent_ids = heapq.nlargest(5, range(len(records)), key=created_dates.__getitem__)
+    recent_records = [(i, records[i]) for i in recent_ids]
 
     return {
         "today": today,
@@ -176,16 +337,12 @@ def build_dashboard(records: List[Record]) -> Dict[str, object]:
         "recent_records": recent_records,
         "chart_labels": chart_labels,
         "chart_minutes": chart_minutes,
+        "chart_colors_bar": chart_colors_bar,
+        "chart_colors_pie": chart_colors_pie,
     }
 
 
-def create_app():
-    from flask import Flask, flash, redirect, render_template_string, request, url_for
-
-    app = Flask(__name__)
-    app.secret_key = "xiaoqianbao-demo-key"
-
-    TEMPLATE = """
+DASHBOARD_TEMPLATE = """
     <!doctype html>
     <html lang=\"zh-CN\">
       <head>
@@ -244,6 +401,7 @@ def create_app():
           .chart-card { background: #f7f8ff; border: 1px solid var(--border); border-radius: 12px; padding: 12px; }
           canvas { width: 100% !important; height: 260px !important; }
         </style>
+        <script src=\"https://cdn.jsdelivr.net/npm/chart.js\" defer></script>
       </head>
       <body>
         <div class=\"page\">
@@ -392,21 +550,16 @@ def create_app():
 
           <div class=\"footer\">本月 {{ start_of_month.strftime('%m/%d') }} - {{ end_of_month.strftime('%m/%d') }} · 共 {{ month_minutes }} 分钟 · 总支出 ¥{{ '%.2f' % total_amount }}</div>
         </div>
-        <script src=\"https://cdn.jsdelivr.net/npm/chart.js\"></script>
         <script>
           const labels = {{ chart_labels | tojson }};
           const minutes = {{ chart_minutes | tojson }};
+          const barColors = {{ chart_colors_bar | tojson }};
+          const pieColors = {{ chart_colors_pie | tojson }};
 
-          function withAlpha(hex, alpha) {
-            const bigint = parseInt(hex.replace('#', ''), 16);
-            const r = (bigint >> 16) & 255;
-            const g = (bigint >> 8) & 255;
-            const b = bigint & 255;
-            return `rgba(${r}, ${g}, ${b}, ${alpha})`;
-          }
-
-          if (labels.length) {
-            const palette = ['#5c6bfe', '#7b8cff', '#a2b1ff', '#c6d0ff', '#8996ff', '#3f4de3'];
+          document.addEventListener('DOMContentLoaded', () => {
+            if (!labels.length) {
+              return;
+            }
             const barCtx = document.getElementById('barChart');
             new Chart(barCtx, {
               type: 'bar',
@@ -415,7 +568,7 @@ def create_app():
                 datasets: [{
                   label: '分钟',
                   data: minutes,
-                  backgroundColor: labels.map((_, i) => withAlpha(palette[i % palette.length], 0.8)),
+                  backgroundColor: barColors,
                   borderRadius: 8,
                 }],
               },
@@ -432,7 +585,7 @@ def create_app():
                 labels,
                 datasets: [{
                   data: minutes,
-                  backgroundColor: labels.map((_, i) => withAlpha(palette[i % palette.length], 0.85)),
+                  backgroundColor: pieColors,
                   borderColor: '#fff',
                   borderWidth: 2,
                 }],
@@ -441,26 +594,70 @@ def create_app():
                 plugins: { legend: { position: 'bottom' } },
               },
             });
-          }
+          });
         </script>
       </body>
     </html>
-    """
+"""
+
+
+def load_dashboard() -> Dict[str, object]:
+    global _dashboard_cache
+    key = (_data_file_key(), date.today().toordinal())
+    if _dashboard_cache is not None and _dashboard_cache[0] == key:
+        return _dashboard_cache[1]
+    dashboard = build_dashboard(load_records())
+    _dashboard_cache = (key, dashboard)
+    return dashboard
+
+
+def create_app():
+    from flask import (
+        Flask,
+        flash,
+        make_response,
+        redirect,
+        render_template,
+        request,
+        session,
+        url_for,
+    )
+
+    app = Flask(__name__)
+    app.secret_key = "xiaoqianbao-demo-key"
+
+    dashboard_template = app.jinja_env.from_string(DASHBOARD_TEMPLATE)
+    etag_token = f"{time.time_ns():x}"
 
     @app.route("/", methods=["GET"])
     def index():
-        records = load_records()
-        dashboard = build_dashboard(records)
-        return render_template_string(TEMPLATE, **dashboard)
+        if "_flashes" in session:
+            response = make_response(render_template(dashboard_template, **load_dashboard()))
+            response.cache_control.no_store = True
+            return response
+
+        key = _data_file_key()
+        mtime_ns, size = key or (0, 0)
+        etag = f"{etag_token}-{mtime_ns:x}-{size:x}-{date.today().toordinal():x}"
+        if request.if_none_match.contains_weak(etag):
+            response = make_response("", 304)
+        else:
+            response = make_response(render_template(dashboard_template, **load_dashboard()))
+            if key is not None:
+                response.last_modified = datetime.fromtimestamp(mtime_ns / 1e9, tz=timezone.utc)
+        response.set_etag(etag, weak=True)
+        response.cache_control.no_cache = True
+        return response
 
     @app.route("/records", methods=["POST"], endpoint="add_record")
     def add_record_route():
-        name = request.form.get("name", "").strip()
-        category = request.form.get("category", "").strip() or "未分类"
-        frequency = request.form.get("frequency", "").strip() or "未填写"
-        minutes_raw = request.form.get("usage_minutes", "").strip()
-        amount_raw = request.form.get("amount", "").strip()
-        created_at = request.form.get("created_at") or date.today().isoformat()
+        form = request.form
+        name = form.get("name", "").strip()
+        category = form.get("category", "").strip() or "未分类"
+        frequency = form.get("frequency", "").strip() or "未填写"
+        minutes_raw = form.get("usage_minutes", "").strip()
+        amount_raw = form.get("amount", "").strip()
+        created_at = form.get("created_at") or today_iso()
 
         if not name or not minutes_raw or not amount_raw:
             flash("请填写名称、时长和金额。")
@@ -469,10 +666,22 @@ def create_app():
         try:
             minutes_value = int(minutes_raw)
             amount_value = float(amount_raw)
+            if not math.isfinite(amount_value):
+                raise ValueError(amount_raw)
         except ValueError:
             flash("金额需为数字，时长需为整数。")
             return redirect(url_for("index"))
 
+        if not minutes_in_range(minutes_value):
+            flash("时长超出范围。")
+            return redirect(url_for("index"))
+
+        try:
+            created_at = date.fromisoformat(created_at).isoformat()
+        except ValueError:
+            flash("日期格式需为 YYYY-MM-DD。")
+            return redirect(url_for("index"))
+
         new_record = Record(
             name=name,
             amount=amount_value,
@@ -482,9 +691,7 @@ def create_app():
             created_at=created_at,
         )
 
-        records = load_records()
-        records.append(new_record)
-        save_records(records)
+        append_record(new_record)
         flash("记录已保存！")
         return redirect(url_for("index"))
 
@@ -495,8 +702,9 @@ def create_app():
             flash("未找到要更新的记录。")
             return redirect(url_for("index"))
 
-        frequency = request.form.get("frequency", "").strip() or records[record_id].usage_frequency
-        minutes_raw = request.form.get("usage_minutes", "").strip()
+        form = request.form
+        frequency = form.get("frequency", "").strip() or records[record_id].usage_frequency
+        minutes_raw = form.get("usage_minutes", "").strip()
 
         try:
             minutes_value = int(minutes_raw)
@@ -504,9 +712,20 @@ def create_app():
             flash("时长需为整数。")
             return redirect(url_for("index"))
 
-        records[record_id].usage_frequency = frequency
-        records[record_id].usage_minutes = minutes_value
-        save_records(records)
+        if not minutes_in_range(minutes_value):
+            flash("时长超出范围。")
+            return redirect(url_for("index"))
+
+        record = records[record_id]
+        if record.usage_frequency == frequency and record.usage_minutes == minutes_value:
+            flash("记录无变化。")
+            return redirect(url_for("index"))
+
+        updated = list(records)
+        updated[record_id] = replace(
+            record, usage_frequency=frequency, usage_minutes=minutes_value
+        )
+        save_records(updated)
         flash("使用时间和频率已更新！")
         return redirect(url_for("index"))
 
@@ -518,22 +737,50 @@ def run_web(args: argparse.Namespace) -> None:
     app.run(host=args.host, port=args.port, debug=args.debug)
 
 
+def parse_amount_arg(value: str) -> float:
+    try:
+        amount = float(value)
+    except ValueError:
+        amount = math.nan
+    if not math.isfinite(amount):
+        raise argparse.ArgumentTypeError(f"无效金额 '{value}'，需为有限数字")
+    return amount
+
+
+def parse_minutes_arg(value: str) -> int:
+    try:
+        minutes = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"无效时长 '{value}'，需为整数") from None
+    if not minutes_in_range(minutes):
+        raise argparse.ArgumentTypeError(f"时长 '{value}' 超出范围")
+    return minutes
+
+
+def parse_date_arg(value: str) -> str:
+    try:
+        return date.fromisoformat(value).isoformat()
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"无效日期 '{value}'，需为 YYYY-MM-DD") from None
+
+
 def build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(description="简易记账应用，支持频率/使用时间统计与 Web 看板。")
     subparsers = parser.add_subparsers(dest="command")
 
     add_parser = subparsers.add_parser("add", help="添加一笔记录")
     add_parser.add_argument("name", help="项目名称")
-    add_parser.add_argument("amount", type=float, help="金额")
+    add_parser.add_argument("amount", type=parse_amount_arg, help="金额")
     add_parser.add_argument("category", help="类别，如餐饮、交通")
     add_parser.add_argument("frequency", help="使用频率，如每天、每周、偶尔")
     add_parser.add_argument(
         "usage_minutes",
-        type=int,
+        type=parse_minutes_arg,
         help="本次使用时长（分钟），类似屏幕使用时间记录",
     )
     add_parser.add_argument(
         "--date",
+        type=parse_date_arg,
         help="记录日期，ISO格式(YYYY-MM-DD)，默认为今天",
     )
     add_parser.set_defaults(func=add_record)
@@ -553,9 +800,55 @@ def build_parser() -> argparse.ArgumentParser:
     return parser
 
 
+def _parse_add_args(argv: List[str]) -> Optional[argparse.Namespace]:
+    positional: List[str] = []
+    created_at = None
+    tokens = iter(argv)
+    for token in tokens:
+        if token == "--date":
+            created_at = next(tokens, None)
+            if created_at is None or created_at.startswith("-"):
+                return None
+        elif token.startswith("--date="):
+            created_at = token[len("--date=") :]
+        elif token.startswith("-"):
+            return None
+        else:
+            positional.append(token)
+
+    if len(positional) != 5:
+        return None
+    name, amount_raw, category, frequency, minutes_raw = positional
+    try:
+        amount = parse_amount_arg(amount_raw)
+        usage_minutes = parse_minutes_arg(minutes_raw)
+        if created_at is not None:
+            created_at = parse_date_arg(created_at)
+    except (ValueError, argparse.ArgumentTypeError):
+        return None
+
+    return argparse.Namespace(
+        command="add",
+        name=name,
+        amount=amount,
+        category=category,
+        frequency=frequency,
+        usage_minutes=usage_minutes,
+        date=created_at,
+        func=add_record,
+    )
+
+
 def main() -> None:
+    argv = sys.argv[1:]
+    if argv[:1] == ["add"]:
+        args = _parse_add_args(argv[1:])
+        if args is not None:
+            args.func(args)
+            return
+
     parser = build_parser()
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
     if not hasattr(args, "func"):
         parser.print_help()
         return